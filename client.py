@@ -2,16 +2,37 @@
 Клиент для NLP микросервиса
 """
 
-import requests
+import asyncio
+import httpx
 import json
 import time
 import sys
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+def _read_server_info(response) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Разбор ответа на GET / для кэширования
+    
+    Returns:
+        Информация о сервере и её ETag; (None, None), если тело не JSON
+    """
+    try:
+        return response.json(), response.headers.get("ETag")
+    except ValueError:
+        return None, None
+
+def _revalidation_headers(info: Optional[Dict[str, Any]], etag: Optional[str]) -> Dict[str, str]:
+    """
+    Заголовки для перепроверки кэшированной информации о сервере
+    """
+    if info is not None and etag:
+        return {"If-None-Match": etag}
+    return {}
 
 class NLPClient:
     """Клиент для взаимодействия с NLP микросервисом"""
     
-    def init(self, base_url: str = "http://localhost:8000"):
+    def __init__(self, base_url: str = "http://localhost:8000"):
         """
         Инициализация клиента
         
@@ -19,32 +40,68 @@ class NLPClient:
             base_url: Базовый URL сервера
         """
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "NLP-Microservice-Client/1.0"
-        })
+        self.client = httpx.Client(
+            base_url=base_url,
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            headers={
+                "User-Agent": "NLP-Microservice-Client/1.0",
+                "Accept-Encoding": "gzip"
+            }
+        )
+        self._server_info: Optional[Dict[str, Any]] = None
+        self._server_etag: Optional[str] = None
+    
+    def close(self):
+        """
+        Закрытие соединений с сервером
+        """
+        self.client.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
     
     def check_connection(self) -> bool:
         """
         Проверка подключения к серверу
         
+        Ответ сервера сохраняется и затем возвращается get_server_info.
+        
         Returns:
             bool: True если сервер доступен
         """
         try:
-            response = self.session.get(f"{self.base_url}/", timeout=5)
+            response = self.client.get("/", timeout=5)
+            if response.status_code == 200:
+                self._server_info, self._server_etag = _read_server_info(response)
             return response.status_code == 200
-        except requests.exceptions.RequestException:
+        except httpx.HTTPError:
             return False
     
-    def get_server_info(self) -> Dict[str, Any]:
+    def get_server_info(self, refresh: bool = False) -> Dict[str, Any]:
         """
         Получение информации о сервере
+        
+        Args:
+            refresh: Перепроверить кэш на сервере (If-None-Match)
         """
+        if self._server_info is not None and not refresh:
+            return self._server_info
+        headers = _revalidation_headers(self._server_info, self._server_etag)
         try:
-            response = self.session.get(f"{self.base_url}/")
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            response = self.client.get("/", headers=headers)
+            if response.status_code == 304:
+                return self._server_info
+            info, etag = _read_server_info(response)
+            if info is None:
+                return {"error": "Invalid server response: body is not JSON"}
+            self._server_info, self._server_etag = info, etag
+            return self._server_info
+        except httpx.HTTPError as e:
             return {"error": f"Connection failed: {str(e)}"}
     
     def get_tfidf(self) -> Dict[str, Any]:
@@ -52,10 +109,10 @@ class NLPClient:
         Получение TF-IDF матрицы
         """
         try:
-            response = self.session.post(f"{self.base_url}/tf-idf")
+            response = self.client.post("/tf-idf")
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             return {"error": str(e)}
     
     def bag_of_words(self, text: str) -> Dict[str, Any]:
@@ -66,13 +123,13 @@ class NLPClient:
             text: Текст для обработки
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/bag-of-words",
+            response = self.client.get(
+                "/bag-of-words",
                 params={"text": text}
             )
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             return {"error": str(e)}
     
     def lsa_analysis(self, n_components: int = 2) -> Dict[str, Any]:
@@ -83,13 +140,13 @@ class NLPClient:
             n_components: Количество компонент
         """
         try:
-            response = self.session.post(
-                f"{self.base_url}/lsa",
+            response = self.client.post(
+                "/lsa",
                 params={"n_components": n_components}
             )
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             return {"error": str(e)}
     
     def tokenize(self, text: str) -> Dict[str, Any]:
@@ -100,13 +157,13 @@ class NLPClient:
             text: Текст для токенизации
         """
         try:
-            response = self.session.post(
-                f"{self.base_url}/text_nltk/tokenize",
-                data={"text": text}
+            response = self.client.post(
+                "/text_nltk/tokenize",
+                json={"text": text}
             )
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             return {"error": str(e)}
     
     def stem(self, text: str) -> Dict[str, Any]:
@@ -117,13 +174,13 @@ class NLPClient:
             text: Текст для стемминга
         """
         try:
-            response = self.session.post(
-                f"{self.base_url}/text_nltk/stem",
-                data={"text": text}
+            response = self.client.post(
+                "/text_nltk/stem",
+                json={"text": text}
             )
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             return {"error": str(e)}
     
     def lemmatize(self, text: str) -> Dict[str, Any]:
@@ -133,13 +190,13 @@ Args:
             text: Текст для лемматизации
         """
         try:
-            response = self.session.post(
-                f"{self.base_url}/text_nltk/lemmatize",
-                data={"text": text}
+            response = self.client.post(
+                "/text_nltk/lemmatize",
+                json={"text": text}
             )
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             return {"error": str(e)}
     
     def pos_tagging(self, text: str) -> Dict[str, Any]:
@@ -150,13 +207,13 @@ Args:
             text: Текст для POS тегирования
         """
         try:
-            response = self.session.post(
-                f"{self.base_url}/text_nltk/pos",
-                data={"text": text}
+            response = self.client.post(
+                "/text_nltk/pos",
+                json={"text": text}
             )
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             return {"error": str(e)}
     
     def ner(self, text: str) -> Dict[str, Any]:
@@ -167,18 +224,176 @@ Args:
             text: Текст для NER
         """
         try:
-            response = self.session.post(
-                f"{self.base_url}/text_nltk/ner",
-                data={"text": text}
+            response = self.client.post(
+                "/text_nltk/ner",
+                json={"text": text}
             )
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             return {"error": str(e)}
     
     def run_demo(self):
         """
         Запуск демонстрации всех функций
+        
+        Синхронная обёртка над AsyncNLPClient.run_demo_async;
+        уже полученная информация о сервере передаётся асинхронному клиенту
+        """
+        async def _run():
+            async with AsyncNLPClient(
+                self.base_url,
+                server_info=self._server_info,
+                server_etag=self._server_etag
+            ) as client:
+                await client.run_demo_async()
+        
+        asyncio.run(_run())
+
+class AsyncNLPClient:
+    """Асинхронный клиент для NLP микросервиса (httpx + HTTP/2)"""
+    
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        server_info: Optional[Dict[str, Any]] = None,
+        server_etag: Optional[str] = None
+    ):
+        """
+        Инициализация клиента
+        
+        Args:
+            base_url: Базовый URL сервера
+            server_info: Ранее полученная информация о сервере
+            server_etag: ETag этой информации
+        """
+        self.base_url = base_url
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20),
+            headers={
+                "User-Agent": "NLP-Microservice-Client/1.0",
+                "Accept-Encoding": "gzip"
+            }
+        )
+        self._server_info = server_info
+        self._server_etag = server_etag
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+    
+    async def _request(self, method: str, path: str, **kwargs) -> Any:
+        """
+        Выполнение запроса к серверу
+        
+        Args:
+            method: HTTP метод
+            path: Путь относительно base_url
+        """
+        try:
+            response = await self.client.request(method, path, **kwargs)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            return {"error": str(e)}
+    
+    async def check_connection(self) -> bool:
+        """
+        Проверка подключения к серверу
+        
+        Ответ сервера сохраняется и затем возвращается get_server_info.
+        
+        Returns:
+            bool: True если сервер доступен
+        """
+        try:
+            response = await self.client.get("/", timeout=5)
+            if response.status_code == 200:
+                self._server_info, self._server_etag = _read_server_info(response)
+            return response.status_code == 200
+        except httpx.HTTPError:
+            return False
+    
+    async def get_server_info(self, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Получение информации о сервере
+        
+        Args:
+            refresh: Перепроверить кэш на сервере (If-None-Match)
+        """
+        if self._server_info is not None and not refresh:
+            return self._server_info
+        headers = _revalidation_headers(self._server_info, self._server_etag)
+        try:
+            response = await self.client.get("/", headers=headers)
+            if response.status_code == 304:
+                return self._server_info
+            info, etag = _read_server_info(response)
+            if info is None:
+                return {"error": "Invalid server response: body is not JSON"}
+            self._server_info, self._server_etag = info, etag
+            return self._server_info
+        except httpx.HTTPError as e:
+            return {"error": f"Connection failed: {str(e)}"}
+    
+    async def get_tfidf(self) -> Dict[str, Any]:
+        """
+        Получение TF-IDF матрицы
+        """
+        return await self._request("POST", "/tf-idf")
+    
+    async def bag_of_words(self, text: str) -> Dict[str, Any]:
+        """
+        Преобразование текста в Bag-of-Words
+        """
+        return await self._request("GET", "/bag-of-words", params={"text": text})
+    
+    async def lsa_analysis(self, n_components: int = 2) -> Dict[str, Any]:
+        """
+        Латентный семантический анализ
+        """
+        return await self._request("POST", "/lsa", params={"n_components": n_components})
+    
+    async def tokenize(self, text: str) -> Dict[str, Any]:
+        """
+        Токенизация текста
+        """
+        return await self._request("POST", "/text_nltk/tokenize", json={"text": text})
+    
+    async def stem(self, text: str) -> Dict[str, Any]:
+        """
+        Стемминг текста
+        """
+        return await self._request("POST", "/text_nltk/stem", json={"text": text})
+    
+    async def lemmatize(self, text: str) -> Dict[str, Any]:
+        """
+        Лемматизация текста
+        """
+        return await self._request("POST", "/text_nltk/lemmatize", json={"text": text})
+    
+    async def pos_tagging(self, text: str) -> Dict[str, Any]:
+        """
+        Частеречная разметка
+        """
+        return await self._request("POST", "/text_nltk/pos", json={"text": text})
+    
+    async def ner(self, text: str) -> Dict[str, Any]:
+        """
+        Распознавание именованных сущностей
+        """
+        return await self._request("POST", "/text_nltk/ner", json={"text": text})
+    
+    async def run_demo_async(self):
+        """
+        Запуск демонстрации всех функций
+        
+        Независимые запросы отправляются параллельно через asyncio.gather.
         """
         print("=" * 60)
         print("NLP MICROSERVICE DEMO")
@@ -186,19 +401,35 @@ Args:
         
         # Проверка подключения
         print("\n1. Проверка подключения к серверу...")
-        if not self.check_connection():
+        # Если информация о сервере уже получена, повторная проверка не нужна
+        if self._server_info is None and not await self.check_connection():
             print("   ❌ Сервер не доступен!")
             print(f"   Убедитесь, что сервер запущен на {self.base_url}")
             return
         
-        server_info = self.get_server_info()
+        test_text = "машинное обучение python программирование"
+        eng_text = "FastAPI is a modern web framework for building APIs with Python 3.7+"
+        rus_text = "Московский государственный университет был основан в 1755 году."
+        
+        (server_info, tfidf, bow, lsa, tokens, stems, pos,
+         rus_tokens, rus_ner) = await asyncio.gather(
+            self.get_server_info(),
+            self.get_tfidf(),
+            self.bag_of_words(test_text),
+            self.lsa_analysis(2),
+            self.tokenize(eng_text),
+            self.stem(eng_text),
+            self.pos_tagging(eng_text),
+            self.tokenize(rus_text),
+            self.ner(rus_text)
+        )
+        
         print(f"   ✅ Сервер доступен")
         print(f"   Версия: {server_info.get('version', 'N/A')}")
         print(f"   Документов в корпусе: {server_info.get('corpus_info', {}).get('documents', 0)}")
         
         # TF-IDF
         print("\n2. TF-IDF матрица...")
-        tfidf = self.get_tfidf()
         if "error" not in tfidf:
             shape = tfidf.get("shape", {})
             print(f"   ✅ Размер матрицы: {shape.get('rows', 0)}x{shape.get('cols', 0)}")
@@ -207,8 +438,6 @@ Args:
         
         # Bag-of-Words
         print("\n3. Bag-of-Words...")
-        test_text = "машинное обучение python программирование"
-        bow = self.bag_of_words(test_text)
         if "error" not in bow:
             vector = bow.get("vector", [])
             print(f"   ✅ Текст: '{test_text}'")
@@ -219,7 +448,6 @@ Args:
         
         # LSA
         print("\n4. LSA анализ...")
-        lsa = self.lsa_analysis(2)
         if "error" not in lsa:
             matrix = lsa.get("matrix", [])
             print(f"   ✅ Размер LSA матрицы: {len(matrix)}x{len(matrix[0]) if matrix else 0}")
@@ -229,34 +457,27 @@ Args:
         
         # NLTK функции
         print("\n5. NLTK функции (английский текст)...")
-        eng_text = "FastAPI is a modern web framework for building APIs with Python 3.7+"
         
         # Токенизация
-        tokens = self.tokenize(eng_text)
         if "error" not in tokens:
             print(f"   ✅ Токенизация: {len(tokens.get('tokens', []))} токенов")
         
         # Стемминг
-        stems = self.stem(eng_text)
         if "error" not in stems:
             print(f"   ✅ Стемминг: {len(stems.get('stems', []))} стемм")
         
         # POS тегирование
-        pos = self.pos_tagging(eng_text)
         if "error" not in pos:
             print(f"   ✅ POS тегирование: {len(pos.get('pos_tags', []))} тегов")
         
         # Пример на русском
         print("\n6. Пример на русском языке...")
-        rus_text = "Московский государственный университет был основан в 1755 году."
         
         # Токенизация русского текста
-        rus_tokens = self.tokenize(rus_text)
         if "error" not in rus_tokens:
             print(f"   ✅ Токенизация (русский): {rus_tokens.get('tokens', [])}")
         
         # NER для русского текста
-        rus_ner = self.ner(rus_text)
         if "error" not in rus_ner:
             entities = rus_ner.get("entities", [])
             print(f"   ✅ NER найдено сущностей: {len(entities)}")
@@ -385,7 +606,7 @@ def interactive_mode(client: NLPClient):
                     print("Текст не может быть пустым!")
             
             elif choice == "9":
-                result = client.get_server_info()
+                result = client.get_server_info(refresh=True)
                 print("\nИнформация о сервере:")
                 for key, value in result.items():
                     print(f"  {key}: {value}")
@@ -425,25 +646,24 @@ def main():
     args = parser.parse_args()
     
     # Создание клиента
-    client = NLPClient(base_url=args.url)
-    
-    # Проверка подключения
-    if not client.check_connection():
-        print(f"❌ Не удалось подключиться к серверу по адресу: {args.url}")
-        print("Убедитесь, что сервер запущен:")
-        print("  python -m server.main")
-        print("  или")
-        print("  uvicorn server.main:app --reload")
-        sys.exit(1)
-    
-    # Запуск режима
-    if args.demo:
-        client.run_demo()
-    elif args.interactive:
-        interactive_mode(client)
-    else:
-        # По умолчанию запускаем демо
-        client.run_demo()
+    with NLPClient(base_url=args.url) as client:
+        # Проверка подключения
+        if not client.check_connection():
+            print(f"❌ Не удалось подключиться к серверу по адресу: {args.url}")
+            print("Убедитесь, что сервер запущен:")
+            print("  python -m server.main")
+            print("  или")
+            print("  uvicorn server.main:app --reload")
+            sys.exit(1)
+        
+        # Запуск режима
+        if args.demo:
+            client.run_demo()
+        elif args.interactive:
+            interactive_mode(client)
+        else:
+            # По умолчанию запускаем демо
+            client.run_demo()
 
-if name == "main":
+if __name__ == "__main__":
     main()
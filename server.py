@@ -1,29 +1,36 @@
+import functools
+import hashlib
+import io
+from collections import defaultdict
+from typing import List, Literal, Optional
+
 import numpy as np
 import nltk
-from fastapi import FastAPI
+import orjson
+import spacy
+from anyio import to_thread
+from fastapi import Body, FastAPI, Header, HTTPException, Query, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+from scipy import sparse
 from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import CountVectorizer
 
 nltk.download([
-    "punkt",
-    "averaged_perceptron_tagger",
     "wordnet",
-    "omw-1.4",
-    "maxent_ne_chunker",
-    "words"
+    "omw-1.4"
 ])
 
-app = FastAPI(title="NLP Microservice")
+app = FastAPI(title="NLP Microservice", default_response_class=ORJSONResponse)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 # ---------- Загрузка корпуса ----------
 def load_corpus():
     try:
         with open("Корпус_Дмитрий.txt", encoding="utf-8") as f:
-            docs = []
-            for line in f:
-                line = line.strip().lower()
-                if line:
-                    docs.append(line)
-            return docs
+            text = f.read().lower()
+        return [line for line in text.splitlines() if line and not line.isspace()]
     except FileNotFoundError:
         return ["файл корпус_дмитрий.txt не найден"]
 
@@ -34,98 +41,265 @@ tokens = []
 for doc in documents:
     tokens.append(doc.split())
 
-vocabulary = []
-for doc in tokens:
+# Инвертированный индекс: слово -> номера документов, где оно встречается.
+# Порядок ключей соответствует первому появлению слова в корпусе.
+postings = defaultdict(set)
+for i, doc in enumerate(tokens):
     for word in doc:
-        if word not in vocabulary:
-            vocabulary.append(word)
+        postings[word].add(i)
+postings = dict(postings)
+
+vocabulary = list(postings)
 
 doc_count = len(tokens)
 word_count = len(vocabulary)
+vocab_index = {word: i for i, word in enumerate(vocabulary)}
 
-# ---------- TF-IDF (NumPy) ----------
-tf = np.zeros((doc_count, word_count))
-df = np.zeros(word_count)
+# ---------- TF-IDF (scikit-learn) ----------
+# CountVectorizer считает вхождения за один проход; словарь передаётся явно,
+# чтобы сохранить порядок столбцов. DF берётся из инвертированного индекса,
+# idf сглажен так же, как в ручной реализации (и smooth_idf в sklearn).
+# tf = count / len(doc); float32 достаточно и вдвое экономит память.
+vectorizer = CountVectorizer(
+    lowercase=False,
+    token_pattern=r"\S+",
+    vocabulary=vocabulary,
+    dtype=np.float32
+)
+counts = vectorizer.fit_transform(documents)
+df = np.array([len(postings[word]) for word in vocabulary], dtype=np.float32)
+idf = np.log((doc_count + 1) / (df + 1)) + 1
+doc_lengths = np.array([len(doc) for doc in tokens], dtype=np.float32)
+tfidf_matrix = sparse.csr_matrix(
+    sparse.diags(1 / doc_lengths) @ counts @ sparse.diags(idf)
+)
+# Произведение с diags даёт CSR с неупорядоченными столбцами в строках
+tfidf_matrix.sort_indices()
 
-for i in range(doc_count):
-    for j in range(word_count):
-        word = vocabulary[j]
-        tf[i][j] = tokens[i].count(word) / len(tokens[i])
-        if word in tokens[i]:
-            df[j] += 1
+# ---------- LSA ----------
+# SVD считается один раз на максимальное число компонент;
+# запрос с n_components берёт первые n столбцов.
+# При min(shape) < 2 разложение невозможно, и /lsa отвечает ошибкой.
+_LSA_MAX = min(50, min(tfidf_matrix.shape) - 1)
+if _LSA_MAX >= 1:
+    _SVD = TruncatedSVD(n_components=_LSA_MAX, algorithm="randomized")
+    _LSA_FULL = _SVD.fit_transform(tfidf_matrix)
+    _VAR = _SVD.explained_variance_ratio_.cumsum()
+else:
+    _LSA_FULL = np.empty((doc_count, 0), dtype=np.float32)
+    _VAR = np.empty(0, dtype=np.float32)
 
-idf = np.log((doc_count + 1) / (df + 1)) + 1
-tfidf_matrix = tf * idf
+# ---------- Кэш неизменяемых ответов ----------
+HOME_JSON = orjson.dumps({
+    "status": "ready",
+    "documents_loaded": len(documents)
+})
+HOME_ETAG = '"' + hashlib.md5(HOME_JSON).hexdigest() + '"'
+
+# TF-IDF отдаётся в разреженном виде (COO): rows[k], cols[k] -> data[k]
+tfidf_coo = tfidf_matrix.tocoo()
+TFIDF_JSON = orjson.dumps({
+    "rows": tfidf_coo.row,
+    "cols": tfidf_coo.col,
+    "data": tfidf_coo.data,
+    "shape": {"rows": doc_count, "cols": word_count}
+}, option=orjson.OPT_SERIALIZE_NUMPY)
+
+# Бинарный вариант для клиентов с scipy: scipy.sparse.load_npz.
+# Без собственного сжатия: ответ сжимает GZipMiddleware.
+_npz = io.BytesIO()
+sparse.save_npz(_npz, tfidf_matrix, compressed=False)
+TFIDF_NPZ = _npz.getvalue()
 
 # ---------- API ----------
 @app.get("/")
-def home():
-    return {
-        "status": "ready",
-        "documents_loaded": len(documents)
-    }
+async def home(if_none_match: Optional[str] = Header(None)):
+    headers = {"ETag": HOME_ETAG}
+    if if_none_match == HOME_ETAG:
+        return Response(status_code=304, headers=headers)
+    return Response(HOME_JSON, media_type="application/json", headers=headers)
+
+async def _tfidf_dense_rows():
+    # Плотная матрица собирается по одной строке, а не целиком в памяти:
+    # один буфер строки заполняется прямо из indptr/indices/data CSR
+    indptr, indices, data = tfidf_matrix.indptr, tfidf_matrix.indices, tfidf_matrix.data
+    row = np.zeros(word_count, dtype=tfidf_matrix.dtype)
+    yield b'{"matrix":['
+    for i in range(doc_count):
+        start, end = indptr[i], indptr[i + 1]
+        row[indices[start:end]] = data[start:end]
+        yield (b"," if i else b"") + orjson.dumps(row, option=orjson.OPT_SERIALIZE_NUMPY)
+        row[indices[start:end]] = 0
+    yield b'],"shape":' + orjson.dumps({"rows": doc_count, "cols": word_count}) + b"}"
 
 @app.post("/tf-idf")
-def tf_idf():
-    return {"matrix": tfidf_matrix.tolist()}
+async def tf_idf(dense: bool = False):
+    if dense:
+        return StreamingResponse(_tfidf_dense_rows(), media_type="application/json")
+    return Response(TFIDF_JSON, media_type="application/json")
+
+@app.post("/tf-idf.npz")
+async def tf_idf_npz():
+    return Response(TFIDF_NPZ, media_type="application/octet-stream")
 
 @app.get("/bag-of-words")
-def bag_of_words(text):
-    words = text.lower().split()
-    vector = np.zeros(word_count, dtype=int)
+async def bag_of_words(text: str):
+    vector = np.zeros(word_count, dtype=np.uint8)
 
-    for i in range(word_count):
-        if vocabulary[i] in words:
-            vector[i] = 1
+    for word in set(text.lower().split()):
+        j = vocab_index.get(word)
+        if j is not None:
+            vector[j] = 1
 
-    return {"vector": vector.tolist()}
+    return ORJSONResponse({
+        "vector": vector,
+        "found_words": [vocabulary[j] for j in np.flatnonzero(vector)]
+    })
 
 @app.post("/lsa")
-def lsa(n_components=2):
-    svd = TruncatedSVD(n_components=n_components)
-    result = svd.fit_transform(tfidf_matrix)
-    return {"matrix": result.tolist()}
+async def lsa(n_components: int = Query(2, ge=1, le=max(_LSA_MAX, 1))):
+    if _LSA_MAX < 1:
+        raise HTTPException(
+            status_code=409,
+            detail="LSA недоступен: в корпусе слишком мало документов или слов"
+        )
+    return ORJSONResponse({
+        "matrix": np.ascontiguousarray(_LSA_FULL[:, :n_components]),
+        "total_variance": float(_VAR[n_components - 1])
+    })
+
+# ---------- NLP (spaCy + NLTK) ----------
+# spaCy выполняет токенизацию, POS и NER;
+# NLTK используется только для стемминга и лемматизации.
+_NLP = spacy.load("en_core_web_sm", disable=["parser", "lemmatizer"])
+_STEMMER = nltk.stem.SnowballStemmer("english")
+_LEMMATIZER = nltk.stem.WordNetLemmatizer()
+_LEMMATIZER.lemmatize("warm")  # принудительная загрузка WordNet
+
+def entities_json(entities):
+    return [{"entity": text, "type": label} for text, label in entities]
+
+# Кэшируются только результаты (кортежи строк), а не объекты Doc;
+# длинные тексты не кэшируются, чтобы кэш не разрастался.
+_CACHE_MAX_CHARS = 10_000
+
+def _cached(func):
+    cached = functools.lru_cache(maxsize=1024)(func)
+
+    @functools.wraps(func)
+    def wrapper(text):
+        if len(text) > _CACHE_MAX_CHARS:
+            return func(text)
+        return cached(text)
+
+    return wrapper
+
+def _tags_of(doc):
+    return tuple((token.text, token.tag_) for token in doc)
+
+def _ents_of(doc):
+    return tuple((ent.text, ent.label_) for ent in doc.ents)
+
+@_cached
+def _tokenize(text):
+    return tuple(token.text for token in _NLP.make_doc(text))
+
+@_cached
+def _pos(text):
+    return _tags_of(_NLP(text, disable=["ner"]))
+
+@_cached
+def _tokens_and_entities(text):
+    doc = _NLP(text)
+    return tuple(token.text for token in doc), _ents_of(doc)
+
+@_cached
+def _pos_and_entities(text):
+    # Один проход конвейера, когда нужны и POS, и NER
+    doc = _NLP(text)
+    return _tags_of(doc), _ents_of(doc)
+
+# CPU-нагруженная обработка выполняется в пуле потоков,
+# чтобы не блокировать цикл событий
+def _tokenize_sync(text):
+    return {"tokens": list(_tokenize(text))}
+
+def _stem_sync(text):
+    result = []
+    for word in _tokenize(text):
+        result.append(_STEMMER.stem(word))
+    return {"stems": result}
+
+def _lemmatize_sync(text):
+    result = []
+    for word in _tokenize(text):
+        result.append(_LEMMATIZER.lemmatize(word))
+    return {"lemmas": result}
+
+def _pos_sync(text):
+    return {"pos_tags": _pos(text)}
+
+def _ner_sync(text):
+    _, entities = _tokens_and_entities(text)
+    return {"entities": entities_json(entities)}
+
+class BatchReq(BaseModel):
+    texts: List[str]
+    ops: List[Literal["tokenize", "stem", "lemmatize", "pos", "ner"]]
+
+def _batch_sync(req: BatchReq):
+    # Каждый текст токенизируется не больше одного раза: при POS/NER
+    # токены берутся из того же прохода конвейера spaCy
+    want_pos = "pos" in req.ops
+    want_ner = "ner" in req.ops
+    want_tokens = any(op in req.ops for op in ("tokenize", "stem", "lemmatize"))
+    results = []
+    for text in req.texts:
+        if want_pos and want_ner:
+            tags, entities = _pos_and_entities(text)
+            tokens = [word for word, _ in tags]
+        elif want_pos:
+            tags = _pos(text)
+            tokens = [word for word, _ in tags]
+        elif want_ner:
+            tokens, entities = _tokens_and_entities(text)
+        elif want_tokens:
+            tokens = _tokenize(text)
+        out = {}
+        if "tokenize" in req.ops:
+            out["tokens"] = list(tokens)
+        if "stem" in req.ops:
+            out["stems"] = [_STEMMER.stem(word) for word in tokens]
+        if "lemmatize" in req.ops:
+            out["lemmas"] = [_LEMMATIZER.lemmatize(word) for word in tokens]
+        if want_pos:
+            out["pos_tags"] = tags
+        if want_ner:
+            out["entities"] = entities_json(entities)
+        results.append(out)
+
+    return results
 
-# ---------- NLTK ----------
 @app.post("/text_nltk/tokenize")
-def tokenize(text):
-    return nltk.word_tokenize(text)
+async def tokenize(text: str = Body(..., embed=True)):
+    return await to_thread.run_sync(_tokenize_sync, text)
 
 @app.post("/text_nltk/stem")
-def stem(text):
-    stemmer = nltk.stem.SnowballStemmer("english")
-    result = []
-    for word in nltk.word_tokenize(text):
-        result.append(stemmer.stem(word))
-    return result
+async def stem(text: str = Body(..., embed=True)):
+    return await to_thread.run_sync(_stem_sync, text)
 
 @app.post("/text_nltk/lemmatize")
-def lemmatize(text):
-    lemmatizer = nltk.stem.WordNetLemmatizer()
-    result = []
-    for word in nltk.word_tokenize(text):
-        result.append(lemmatizer.lemmatize(word))
-    return result
+async def lemmatize(text: str = Body(..., embed=True)):
+    return await to_thread.run_sync(_lemmatize_sync, text)
 
 @app.post("/text_nltk/pos")
-def pos(text):
-    return nltk.pos_tag(nltk.word_tokenize(text))
+async def pos(text: str = Body(..., embed=True)):
+    return await to_thread.run_sync(_pos_sync, text)
 
 @app.post("/text_nltk/ner")
-def ner(text):
-    tokens = nltk.word_tokenize(text)
-    tags = nltk.pos_tag(tokens)
-    chunks = nltk.ne_chunk(tags)
-
-    entities = []
-    for chunk in chunks:
-        if hasattr(chunk, "label"):
-            words = []
-            for item in chunk:
-                words.append(item[0])
-            entities.append({
-                "entity": " ".join(words),
-                "label": chunk.label()
-            })
-
-    return entities
+async def ner(text: str = Body(..., embed=True)):
+    return await to_thread.run_sync(_ner_sync, text)
+
+@app.post("/text_nltk/batch")
+async def batch(req: BatchReq):
+    return await to_thread.run_sync(_batch_sync, req)